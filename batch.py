@@ -0,0 +1,169 @@
+import inspect
+import json
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from starlette.routing import Match
+
+from cache import listing_cache
+from database import SessionLocal, get_engine
+
+WRITE_METHODS = {"POST", "PUT", "DELETE"}
+
+# Session.info flag: the session stays open until the batch has encoded
+# every result, so endpoints may hand it to lazily read response bodies
+BATCH_SESSION = "batch_session"
+
+class BatchExecutor:
+    """Runs batch operations against existing endpoints of an app.
+
+    Operations are routed exactly as the app would route them, then the
+    endpoint function is called directly with the batch's database session
+    and already authenticated user, skipping per-request auth and session
+    setup. Only endpoints listed in ``endpoints`` may be called.
+    """
+
+    def __init__(self, app, endpoints):
+        self.app = app
+        self.endpoints = set(endpoints)
+        self._adapters = {}
+        self._parameters = {}
+
+    def _match(self, method, path):
+        """Return (route, path_params) or raise HTTPException like the router would"""
+        scope = {"type": "http", "method": method, "path": path}
+        partial = None
+        for route in self.app.router.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route, child_scope.get("path_params", {})
+            if match == Match.PARTIAL and partial is None:
+                partial = route
+        if partial is not None:
+            raise HTTPException(status_code=status.HTTP_405_METHOD_NOT_ALLOWED, detail="Method Not Allowed")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+    def _route_parameters(self, route):
+        """Return (name, path param adapter, body model) for each endpoint parameter, cached per route"""
+        parameters = self._parameters.get(route.unique_id)
+        if parameters is None:
+            path_names = set(route.param_convertors)
+            parameters = []
+            for name, parameter in inspect.signature(route.endpoint).parameters.items():
+                annotation = parameter.annotation
+                adapter = TypeAdapter(annotation) if name in path_names else None
+                is_model = inspect.isclass(annotation) and issubclass(annotation, BaseModel)
+                parameters.append((name, adapter, annotation if is_model else None))
+            self._parameters[route.unique_id] = parameters
+        return parameters
+
+    def _arguments(self, route, path_params, body, db, current_user):
+        """Build the endpoint's keyword arguments from path params and body"""
+        arguments = {}
+        for name, adapter, body_model in self._route_parameters(route):
+            if name == "db":
+                arguments[name] = db
+            elif name == "current_user":
+                arguments[name] = current_user
+            elif adapter is not None:
+                arguments[name] = adapter.validate_python(path_params[name])
+            elif body_model is not None:
+                arguments[name] = body_model.model_validate(body or {})
+        return arguments
+
+    async def _encode(self, route, result):
+        """Return (status_code, JSON bytes) for an endpoint's return value"""
+        if isinstance(result, StreamingResponse):
+            return result.status_code, b"".join([chunk async for chunk in result.body_iterator])
+        if isinstance(result, Response):
+            return result.status_code, result.body
+        if route.response_model is None:
+            return status.HTTP_200_OK, json.dumps(jsonable_encoder(result)).encode()
+        adapter = self._adapters.get(route.unique_id)
+        if adapter is None:
+            adapter = self._adapters[route.unique_id] = TypeAdapter(route.response_model)
+        return status.HTTP_200_OK, adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+    async def run_operation(self, operation, db, current_user):
+        """Run one operation, returning (status_code, JSON bytes)"""
+        try:
+            route, path_params = self._match(operation.method, operation.path)
+            if not isinstance(route, APIRoute) or route.endpoint not in self.endpoints:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Operation not supported in a batch"
+                )
+            arguments = self._arguments(route, path_params, operation.body, db, current_user)
+            return await self._encode(route, await route.endpoint(**arguments))
+        except HTTPException as e:
+            return e.status_code, json.dumps({"detail": e.detail}).encode()
+        except ValidationError as e:
+            errors = jsonable_encoder(e.errors(include_url=False, include_context=False))
+            return status.HTTP_422_UNPROCESSABLE_ENTITY, json.dumps({"detail": errors}).encode()
+
+    async def run_reads(self, operations, db, current_user):
+        """Run independent read operations on one session"""
+        results = [await self.run_operation(operation, db, current_user) for operation in operations]
+        return results, None
+
+    async def run_transaction(self, operations, current_user):
+        """Run operations in one database transaction, stopping at the first failure.
+
+        Endpoints still call commit(); the session joins an outer transaction
+        through savepoints, so nothing is committed until every operation has
+        succeeded.
+        """
+        results = []
+        with get_engine().connect() as connection:
+            transaction = connection.begin()
+            db = SessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+            db.info[BATCH_SESSION] = True
+            # Listings read here may include writes that are later rolled back
+            db.info["skip_listing_cache"] = True
+            try:
+                for operation in operations:
+                    status_code, content = await self.run_operation(operation, db, current_user)
+                    results.append((status_code, content))
+                    if status_code >= 400:
+                        break
+            finally:
+                db.close()
+
+            committed = len(results) == len(operations) and results[-1][0] < 400
+            if committed:
+                transaction.commit()
+            else:
+                transaction.rollback()
+
+        # Endpoints' invalidations took effect locally when their savepoints
+        # were released, before the outer commit; apply them again now
+        listing_cache.invalidate_local()
+
+        skipped = json.dumps({"detail": "Not executed, transaction rolled back"}).encode()
+        results.extend(
+            (status.HTTP_424_FAILED_DEPENDENCY, skipped) for _ in operations[len(results):]
+        )
+        return results, committed
+
+    async def execute(self, batch, db, current_user):
+        """Run a batch request and return the encoded response body"""
+        if not batch.transactional and any(op.method in WRITE_METHODS for op in batch.operations):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Write operations require \"transactional\": true"
+            )
+        if batch.transactional:
+            # Hand the request's connection back before taking one for the
+            # transaction; close() keeps current_user loaded, rollback() would not
+            db.close()
+            results, committed = await self.run_transaction(batch.operations, current_user)
+        else:
+            db.info[BATCH_SESSION] = True
+            results, committed = await self.run_reads(batch.operations, db, current_user)
+
+        # Bodies are already JSON, so splice them in rather than re-encoding
+        parts = [b'{"status":%d,"body":%s}' % (status_code, content) for status_code, content in results]
+        return b'{"results":[' + b",".join(parts) + b'],"committed":' + json.dumps(committed).encode() + b"}"
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Worker scaling benchmark for Employee Task Manager API
+
+Starts serve.py with an increasing number of workers and measures login
+throughput (POST /token, dominated by bcrypt) for each. With one core per
+worker the speedup should stay close to the worker count.
+
+Requires a seeded database (python init_db.py). Run from the project root:
+    python benchmarks/scaling.py [--workers 1 2 4] [--duration 10]
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def wait_until_live(base_url, timeout=30):
+    """Poll the liveness endpoint until the server answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/health/live", timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s")
+
+def run_load(base_url, clients, duration):
+    """Hammer POST /token from several threads and return requests per second"""
+    body = urllib.parse.urlencode({"username": "admin", "password": "admin123"}).encode()
+    completed = [0] * clients
+    failed = [0] * clients
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        while time.monotonic() < deadline:
+            request = urllib.request.Request(f"{base_url}/token", data=body)
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                completed[index] += 1
+            except (urllib.error.URLError, ConnectionError):
+                failed[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    return sum(completed) / elapsed, sum(failed)
+
+def benchmark(workers, port, duration):
+    """Start serve.py with the given worker count and measure throughput"""
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_live(base_url)
+        # Two clients per worker keep every worker busy
+        return run_load(base_url, workers * 2, duration)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+
+    print("📈 Employee Task Manager worker scaling benchmark")
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8} {'efficiency':>11} {'errors':>7}")
+    baseline = None
+    for workers in args.workers:
+        throughput, errors = benchmark(workers, args.port, args.duration)
+        baseline = baseline or throughput / workers
+        speedup = throughput / baseline
+        print(f"{workers:>8} {throughput:>10.1f} {speedup:>8.2f} {speedup / workers:>10.0%} {errors:>7}")
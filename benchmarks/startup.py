@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for Employee Task Manager API
+
+Measures how long a fresh worker process takes to import main.py and how
+long the lifespan startup (connection pool warm-up) takes afterwards.
+
+Run from the project root:
+    python benchmarks/startup.py [runs]
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import main; "
+    "print(time.perf_counter() - start)"
+)
+
+def measure_import(runs):
+    """Import main in fresh interpreters and return the timings in seconds"""
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+async def measure_lifespan():
+    """Run the app's lifespan startup/shutdown once and return both timings"""
+    sys.path.insert(0, PROJECT_ROOT)
+    from main import app, lifespan
+
+    start = time.perf_counter()
+    async with lifespan(app):
+        startup = time.perf_counter() - start
+        start = time.perf_counter()
+    shutdown = time.perf_counter() - start
+    return startup, shutdown
+
+def print_timings(title, timings):
+    """Helper function to print a timing summary in milliseconds"""
+    print(f"\n{title}")
+    print(f"  runs:   {len(timings)}")
+    print(f"  median: {statistics.median(timings) * 1000:.1f} ms")
+    print(f"  min:    {min(timings) * 1000:.1f} ms")
+    print(f"  max:    {max(timings) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print("⏱  Employee Task Manager cold start benchmark")
+    print_timings("import main (fresh interpreter)", measure_import(runs))
+
+    startup, shutdown = asyncio.run(measure_lifespan())
+    print("\nlifespan")
+    print(f"  startup (pool warm-up): {startup * 1000:.1f} ms")
+    print(f"  shutdown:               {shutdown * 1000:.1f} ms")
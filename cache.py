@@ -0,0 +1,224 @@
+import logging
+import os
+import select
+import threading
+import uuid
+from collections import OrderedDict
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from database import get_engine
+
+logger = logging.getLogger(__name__)
+
+# Caching is only safe if every worker hears about every write: either via
+# PostgreSQL, or with "local" explicitly chosen for a single process. Left
+# unset, nothing is cached.
+CACHE_CHANNEL = os.getenv("CACHE_CHANNEL", "")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "128"))
+
+NOTIFY_CHANNEL = "cache_invalidation"
+
+# Session.info key for caches to invalidate locally once the session commits
+PENDING_INVALIDATIONS = "pending_cache_invalidations"
+
+class LocalInvalidationChannel:
+    """Per-namespace version counters kept in this process only.
+
+    Stand-in for a shared channel when running a single worker (or in
+    tests); only safe with one process. Publishing bumps the version, and
+    any cache entry stored under an older version is treated as stale.
+    """
+
+    def __init__(self):
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def version(self, namespace):
+        return (self._epoch, self._versions.get(namespace, 0))
+
+    def bump(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def bump_all(self):
+        with self._lock:
+            self._epoch += 1
+
+    @property
+    def listening(self):
+        """Whether writes from other processes are being heard; always, with none"""
+        return True
+
+    def publish(self, namespace, db):
+        """Tell other processes about a write in db's transaction; nobody to tell here"""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+class PostgresInvalidationChannel(LocalInvalidationChannel):
+    """Invalidation shared between worker processes via PostgreSQL LISTEN/NOTIFY.
+
+    Each worker keeps its own version counters and a background thread that
+    bumps them when another worker publishes. If the listening connection is
+    lost every namespace is bumped, since notifications may have been missed,
+    and the channel reports it is not listening until LISTEN is back.
+
+    Notifications carry a random per-process token rather than the PID, which
+    is only unique within one host: replicas of the same image often give
+    their workers identical PIDs.
+    """
+
+    def __init__(self, poll_interval=1.0):
+        super().__init__()
+        self._poll_interval = poll_interval
+        self._stopping = threading.Event()
+        self._thread = None
+        self._token = uuid.uuid4().hex
+        self._listening = False
+
+    @property
+    def listening(self):
+        return self._listening
+
+    def publish(self, namespace, db):
+        # Queued in the writing transaction: PostgreSQL delivers it on commit
+        # and drops it on rollback
+        db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": f"{self._token}:{namespace}"},
+        )
+
+    def start(self):
+        if self._thread is None:
+            # A fresh token per started worker, in case the channel was
+            # created before the process forked
+            self._token = uuid.uuid4().hex
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join(timeout=self._poll_interval * 2)
+            self._thread = None
+        self._listening = False
+
+    def _listen(self):
+        # Dedicated connection outside the request pool
+        listener_engine = create_engine(get_engine().url, poolclass=NullPool)
+        while not self._stopping.is_set():
+            try:
+                raw = listener_engine.raw_connection()
+            except Exception as e:
+                logger.warning("Cache invalidation listener could not connect: %s", e)
+                self._stopping.wait(self._poll_interval)
+                continue
+            try:
+                dbapi_connection = raw.driver_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Anything published before LISTEN took effect was missed
+                self.bump_all()
+                self._listening = True
+                while not self._stopping.is_set():
+                    if select.select([dbapi_connection], [], [], self._poll_interval) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notify = dbapi_connection.notifies.pop(0)
+                        token, _, namespace = notify.payload.partition(":")
+                        if token != self._token:
+                            self.bump(namespace)
+            except Exception as e:
+                logger.warning("Cache invalidation listener lost its connection: %s", e)
+                self._listening = False
+                self.bump_all()
+            finally:
+                raw.close()
+        listener_engine.dispose()
+
+class VersionedCache:
+    """Small LRU cache whose entries expire when their namespace version changes"""
+
+    def __init__(self, channel, namespace, max_entries=CACHE_MAX_ENTRIES, enabled=True):
+        self.channel = channel
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value, or None if missing or stale"""
+        # Without a working channel, other workers' writes would go unnoticed
+        if not self.enabled or not self.channel.listening:
+            return None
+        version = self.channel.version(self.namespace)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def version(self):
+        """Current namespace version; read it before loading the value to store"""
+        return self.channel.version(self.namespace)
+
+    def set(self, key, value, version):
+        if not self.enabled or not self.channel.listening:
+            return
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, db):
+        """Invalidate this namespace in every worker when db's transaction commits.
+
+        Call before db.commit(). This worker's version is bumped only after
+        the commit, so a concurrent request cannot cache pre-commit data
+        under the new version.
+        """
+        self.channel.publish(self.namespace, db)
+        db.info.setdefault(PENDING_INVALIDATIONS, set()).add(self)
+
+    def invalidate_local(self):
+        """Invalidate this namespace in this worker right away"""
+        self.channel.bump(self.namespace)
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session):
+    for cache in session.info.pop(PENDING_INVALIDATIONS, ()):
+        cache.invalidate_local()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+def _create_channel():
+    if CACHE_CHANNEL == "postgres":
+        return PostgresInvalidationChannel()
+    if CACHE_CHANNEL not in ("", "local"):
+        logger.warning("Unknown CACHE_CHANNEL %r, caching disabled", CACHE_CHANNEL)
+    return LocalInvalidationChannel()
+
+invalidation_channel = _create_channel()
+CACHE_ENABLED = CACHE_CHANNEL in ("postgres", "local")
+
+# Serialized GET /employees and GET /tasks responses. Employees embed their
+# tasks and tasks embed their employee, so both share one namespace.
+listing_cache = VersionedCache(invalidation_channel, "listings", enabled=CACHE_ENABLED)
@@ -1,21 +1,104 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+import logging
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# The engine is created on first use so that importing this module never
+# touches the database
+_engine = None
+
+class LazyBindSession(Session):
+    """Session that uses the shared engine, creating it on first use, unless given a bind"""
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None and kwargs.get("bind") is None:
+            return get_engine()
+        return super().get_bind(mapper, **kwargs)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=LazyBindSession, autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+def _enable_sqlite_savepoints(engine):
+    """Make pysqlite honour BEGIN/SAVEPOINT so nested transactions can roll back.
+
+    The driver otherwise starts transactions on its own schedule, and a
+    released SAVEPOINT commits for real. This is SQLAlchemy's documented
+    workaround for the pysqlite driver.
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+def get_engine():
+    """Return the shared engine, creating it on first use"""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            DATABASE_URL,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+        if _engine.dialect.name == "sqlite":
+            _enable_sqlite_savepoints(_engine)
+    return _engine
+
+def warm_up_pool():
+    """Open pool_size connections up front so the first requests don't pay for them.
+
+    Returns the number of connections opened. A database that is briefly
+    unavailable is logged rather than raised, so the worker still starts.
+    """
+    engine = get_engine()
+    connections = []
+    try:
+        for _ in range(engine.pool.size()):
+            connection = engine.connect()
+            connections.append(connection)
+        if connections:
+            connections[0].execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Connection pool warm-up failed: %s", e)
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+def check_database():
+    """Return True if the database answers a trivial query"""
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.warning("Database check failed: %s", e)
+        return False
+
+def dispose_engine():
+    """Close all pooled connections, if the engine was ever created"""
+    global _engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
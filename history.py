@@ -0,0 +1,178 @@
+from datetime import date, datetime
+import asyncio
+import logging
+import os
+
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.orm import Session
+
+from database import get_engine
+from models import TaskEvent, TaskEventType, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Monthly partitions created ahead of time; rows outside them land in
+# task_events_default until maintenance moves them to their own partition
+PARTITION_MONTHS_AHEAD = 2
+PARTITION_CHECK_INTERVAL = int(os.getenv("PARTITION_CHECK_INTERVAL", "3600"))
+PARTITION_RETRY_INTERVAL = 60
+
+def record_task_event(db: Session, task_id: int, event_type: TaskEventType, changes: dict = None, actor_id: int = None):
+    """Append a task event to the session; it is committed with the task change"""
+    changes = dict(changes or {})
+    status = changes.pop("status", None)
+    event = TaskEvent(
+        task_id=task_id,
+        event_type=event_type,
+        status=status,
+        actor_id=actor_id,
+        changes=jsonable_encoder(changes) or None,
+    )
+    db.add(event)
+    return event
+
+def iter_task_history(db: Session, task_id: int, batch_size: int = 500):
+    """Yield a task's events oldest first without loading the whole history"""
+    statement = (
+        select(TaskEvent)
+        .where(TaskEvent.task_id == task_id)
+        .order_by(TaskEvent.occurred_at, TaskEvent.id)
+        .execution_options(yield_per=batch_size)
+    )
+    yield from db.scalars(statement)
+
+def has_task_history(db: Session, task_id: int):
+    return db.scalar(select(TaskEvent.id).where(TaskEvent.task_id == task_id).limit(1)) is not None
+
+def _seconds_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400
+
+def cycle_time_stats(db: Session, status: TaskStatus, since: datetime, until: datetime = None):
+    """Aggregate how long tasks stayed in ``status`` after entering it in [since, until).
+
+    Only tasks that entered the status in the window are read (via the
+    status/occurred_at index), and only their events from ``since`` on (via
+    the task_id/occurred_at index), so the rest of the log is never scanned.
+    """
+    entered = select(TaskEvent.task_id).where(
+        TaskEvent.status == status,
+        TaskEvent.occurred_at >= since,
+    )
+    if until is not None:
+        entered = entered.where(TaskEvent.occurred_at < until)
+
+    # Status changes and deletions, each paired with the next one for the same task
+    transitions = (
+        select(
+            TaskEvent.status,
+            TaskEvent.occurred_at.label("entered_at"),
+            func.lead(TaskEvent.occurred_at).over(
+                partition_by=TaskEvent.task_id,
+                order_by=(TaskEvent.occurred_at, TaskEvent.id),
+            ).label("left_at"),
+        )
+        .where(
+            TaskEvent.task_id.in_(entered),
+            TaskEvent.occurred_at >= since,
+            or_(TaskEvent.status.isnot(None), TaskEvent.event_type == TaskEventType.deleted),
+        )
+        .subquery()
+    )
+
+    duration = _seconds_between(db, transitions.c.entered_at, transitions.c.left_at)
+    statement = select(
+        func.count(transitions.c.left_at),
+        func.count() - func.count(transitions.c.left_at),
+        func.avg(duration),
+        func.min(duration),
+        func.max(duration),
+    ).where(transitions.c.status == status)
+    if until is not None:
+        statement = statement.where(transitions.c.entered_at < until)
+
+    completed, in_status, average, minimum, maximum = db.execute(statement).one()
+    return {
+        "status": status,
+        "since": since,
+        "until": until,
+        "completed": completed,
+        "in_status": in_status,
+        "average_seconds": float(average) if average is not None else None,
+        "min_seconds": float(minimum) if minimum is not None else None,
+        "max_seconds": float(maximum) if maximum is not None else None,
+    }
+
+def _month_start(year: int, month: int):
+    return date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+def _partition_name(start: date):
+    return f"task_events_y{start.year}m{start.month:02d}"
+
+def ensure_task_event_partitions(engine, months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """Give this month, the next few, and any month stranded in the default partition their own partition.
+
+    PostgreSQL refuses to add a range that task_events_default already holds
+    rows for, so each new partition is created detached, filled with the
+    matching rows moved out of the default partition, then attached, all in
+    one transaction. Returns the names of the partitions created; no-op on
+    databases other than PostgreSQL. Errors are raised.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+    today = date.today()
+    months = {_month_start(today.year, today.month + offset) for offset in range(months_ahead + 1)}
+    created = []
+    with engine.begin() as connection:
+        # Several workers run this; one at a time
+        connection.execute(text("SELECT pg_advisory_xact_lock(hashtext('task_events_partitions'))"))
+        # Keep new rows out of the default partition while its rows are moved
+        connection.execute(text("LOCK TABLE task_events_default IN EXCLUSIVE MODE"))
+        months.update(connection.execute(text(
+            "SELECT DISTINCT date_trunc('month', occurred_at)::date FROM task_events_default"
+        )).scalars())
+        for start in sorted(months):
+            name = _partition_name(start)
+            if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+                continue
+            end = _month_start(start.year, start.month + 1)
+            connection.execute(text(f"CREATE TABLE {name} (LIKE task_events INCLUDING DEFAULTS)"))
+            connection.execute(text(
+                "WITH moved AS ("
+                "DELETE FROM task_events_default WHERE occurred_at >= :start AND occurred_at < :end "
+                "RETURNING *"
+                f") INSERT INTO {name} SELECT * FROM moved"
+            ), {"start": start, "end": end})
+            connection.execute(text(
+                f"ALTER TABLE task_events ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            created.append(name)
+    if created:
+        logger.info("Created task_events partitions: %s", ", ".join(created))
+    return created
+
+def run_partition_maintenance():
+    """Run ensure_task_event_partitions, logging any failure as an error; returns True on success"""
+    try:
+        ensure_task_event_partitions(get_engine())
+        return True
+    except Exception:
+        logger.exception(
+            "task_events partition maintenance failed; new events go to "
+            "task_events_default until it succeeds"
+        )
+        return False
+
+async def maintain_task_event_partitions(succeeded: bool):
+    """Keep partitions ahead of the clock for as long as the process runs.
+
+    Re-runs maintenance every PARTITION_CHECK_INTERVAL seconds, or every
+    PARTITION_RETRY_INTERVAL seconds while it is failing.
+    """
+    while True:
+        await asyncio.sleep(PARTITION_CHECK_INTERVAL if succeeded else PARTITION_RETRY_INTERVAL)
+        succeeded = await run_in_threadpool(run_partition_maintenance)
@@ -1,13 +1,20 @@
-from database import SessionLocal, engine
-from models import Base, User, Employee, Task, TaskStatus
+from alembic import command
+from alembic.config import Config
+from database import SessionLocal, get_engine
+from history import ensure_task_event_partitions, record_task_event
+from models import User, Employee, Task, TaskStatus, TaskEventType
 from auth import get_password_hash
 from datetime import datetime, timedelta
+import os
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
 
 def init_db():
-    """Initialize the database and create tables"""
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Database tables created successfully!")
+    """Initialize the database by applying all Alembic migrations"""
+    print("Applying database migrations...")
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    ensure_task_event_partitions(get_engine())
+    print("Database schema is up to date!")
 
 def seed_data():
     """Seed the database with initial data"""
@@ -102,6 +109,17 @@ def seed_data():
         
         for task in tasks:
             db.add(task)
+        db.flush()
+        
+        # Start each task's history
+        for task in tasks:
+            record_task_event(db, task.id, TaskEventType.created, {
+                "title": task.title,
+                "description": task.description,
+                "due_date": task.due_date,
+                "employee_id": task.employee_id,
+                "status": task.status
+            })
         
         db.commit()
         
@@ -1,31 +1,76 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from datetime import timedelta
-from typing import List
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
 
-from database import get_db, engine
-from models import Base, User, Employee, Task, TaskStatus
+from batch import BATCH_SESSION, BatchExecutor
+from cache import invalidation_channel, listing_cache
+from database import SessionLocal, get_db, warm_up_pool, check_database, dispose_engine
+from history import (
+    record_task_event, iter_task_history, has_task_history,
+    cycle_time_stats, run_partition_maintenance, maintain_task_event_partitions
+)
+from models import User, Employee, Task, TaskStatus, TaskEventType
 from schemas import (
     UserCreate, User as UserSchema, Token,
     EmployeeCreate, EmployeeUpdate, Employee as EmployeeSchema,
-    TaskCreate, TaskUpdate, Task as TaskSchema
+    TaskCreate, TaskUpdate, Task as TaskSchema,
+    TaskEvent as TaskEventSchema, CycleTimeStats,
+    BatchRequest, BatchResponse
 )
 from auth import (
     authenticate_user, create_access_token, get_current_user,
     get_password_hash, ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the database connection pool on startup and release it on shutdown"""
+    await run_in_threadpool(warm_up_pool)
+    partitions_ready = await run_in_threadpool(run_partition_maintenance)
+    partition_maintenance = asyncio.create_task(maintain_task_event_partitions(partitions_ready))
+    invalidation_channel.start()
+    yield
+    invalidation_channel.stop()
+    partition_maintenance.cancel()
+    await run_in_threadpool(dispose_engine)
 
 app = FastAPI(
     title="Employee Task Manager API",
     description="A REST API for managing employees and their tasks",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+employee_list_adapter = TypeAdapter(List[EmployeeSchema])
+task_list_adapter = TypeAdapter(List[TaskSchema])
+
+def naive_utc(value):
+    """Convert an aware datetime to the naive UTC the DateTime columns store"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def cached_listing(key, adapter, query):
+    """Serve a JSON listing from listing_cache, serializing it on a miss"""
+    if query.session.info.get("skip_listing_cache"):
+        items = adapter.validate_python(query.all(), from_attributes=True)
+        return Response(content=adapter.dump_json(items), media_type="application/json")
+    content = listing_cache.get(key)
+    if content is None:
+        version = listing_cache.version()
+        items = adapter.validate_python(query.all(), from_attributes=True)
+        content = adapter.dump_json(items)
+        listing_cache.set(key, content, version)
+    return Response(content=content, media_type="application/json")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -79,8 +124,7 @@ async def list_employees(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    employees = db.query(Employee).all()
-    return employees
+    return cached_listing("employees", employee_list_adapter, db.query(Employee))
 
 @app.post("/employees", response_model=EmployeeSchema)
 async def create_employee(
@@ -98,6 +142,7 @@ async def create_employee(
     
     db_employee = Employee(**employee.dict())
     db.add(db_employee)
+    listing_cache.invalidate(db)
     db.commit()
     db.refresh(db_employee)
     return db_employee
@@ -143,6 +188,7 @@ async def update_employee(
     for field, value in update_data.items():
         setattr(employee, field, value)
     
+    listing_cache.invalidate(db)
     db.commit()
     db.refresh(employee)
     return employee
@@ -168,6 +214,7 @@ async def delete_employee(
         )
     
     db.delete(employee)
+    listing_cache.invalidate(db)
     db.commit()
     return {"message": "Employee deleted successfully"}
 
@@ -177,8 +224,7 @@ async def list_tasks(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    tasks = db.query(Task).all()
-    return tasks
+    return cached_listing("tasks", task_list_adapter, db.query(Task))
 
 @app.post("/tasks", response_model=TaskSchema)
 async def create_task(
@@ -197,10 +243,25 @@ async def create_task(
     
     db_task = Task(**task.dict())
     db.add(db_task)
+    db.flush()
+    created = {field: value for field, value in task.dict().items() if value is not None}
+    created["status"] = db_task.status
+    record_task_event(db, db_task.id, TaskEventType.created, created, current_user.id)
+    listing_cache.invalidate(db)
     db.commit()
     db.refresh(db_task)
     return db_task
 
+@app.get("/tasks/cycle-time", response_model=CycleTimeStats)
+async def get_cycle_time(
+    since: datetime,
+    until: Optional[datetime] = None,
+    task_status: TaskStatus = Query(TaskStatus.ongoing, alias="status"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return cycle_time_stats(db, task_status, since, until)
+
 @app.get("/tasks/{task_id}", response_model=TaskSchema)
 async def get_task(
     task_id: int,
@@ -239,9 +300,17 @@ async def update_task(
             )
     
     update_data = task_update.dict(exclude_unset=True)
+    changes = {}
     for field, value in update_data.items():
+        value = naive_utc(value)
+        if getattr(task, field) != value:
+            changes[field] = value
         setattr(task, field, value)
     
+    # Record only what actually changed, in the same transaction
+    if changes:
+        record_task_event(db, task.id, TaskEventType.updated, changes, current_user.id)
+    listing_cache.invalidate(db)
     db.commit()
     db.refresh(task)
     return task
@@ -259,10 +328,77 @@ async def delete_task(
             detail="Task not found"
         )
     
+    record_task_event(db, task.id, TaskEventType.deleted, actor_id=current_user.id)
     db.delete(task)
+    listing_cache.invalidate(db)
     db.commit()
     return {"message": "Task deleted successfully"}
 
+def stream_task_history(task_id: int, db: Optional[Session] = None):
+    """Encode a task's history as a JSON array, one event at a time.
+
+    A request's own session is closed before the body is streamed, so
+    without ``db`` a session of our own is opened. A batch passes its
+    session, which stays open until the body has been read.
+    """
+    own_session = db is None
+    if own_session:
+        db = SessionLocal()
+    try:
+        yield b"["
+        for index, event in enumerate(iter_task_history(db, task_id)):
+            if index:
+                yield b","
+            yield TaskEventSchema.model_validate(event).model_dump_json().encode()
+        yield b"]"
+    finally:
+        if own_session:
+            db.close()
+
+@app.get("/tasks/{task_id}/history", response_model=List[TaskEventSchema])
+async def get_task_history(
+    task_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Deleted tasks keep their history
+    if not has_task_history(db, task_id) and not db.query(Task).filter(Task.id == task_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    batch_db = db if db.info.get(BATCH_SESSION) else None
+    return StreamingResponse(stream_task_history(task_id, batch_db), media_type="application/json")
+
+# Batch endpoint
+batch_executor = BatchExecutor(app, [
+    list_employees, create_employee, get_employee, update_employee, delete_employee,
+    list_tasks, create_task, get_task, update_task, delete_task, get_task_history,
+])
+
+@app.post("/batch", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    content = await batch_executor.execute(batch, db, current_user)
+    return Response(content=content, media_type="application/json")
+
+# Health check endpoints
+@app.get("/health/live")
+def liveness():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+def readiness():
+    if not check_database():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "unavailable", "database": "unreachable"}
+        )
+    return {"status": "ready", "database": "ok"}
+
 @app.get("/")
 def read_root():
     return {
@@ -271,6 +407,8 @@ def read_root():
         "endpoints": {
             "auth": "/token, /register",
             "employees": "/employees",
-            "tasks": "/tasks"
+            "tasks": "/tasks",
+            "batch": "/batch",
+            "health": "/health/live, /health/ready"
         }
     }
\ No newline at end of file
@@ -0,0 +1,73 @@
+"""task indexes: employee_id, status, due_date, updated_at
+
+Indexes are built with CREATE INDEX CONCURRENTLY on PostgreSQL so they
+can be added to a live ``tasks`` table without blocking writes. A failed
+or cancelled concurrent build leaves an INVALID index behind; it is
+dropped and rebuilt on the next run instead of being skipped by
+IF NOT EXISTS.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_INDEXES = ["employee_id", "status", "due_date", "updated_at"]
+
+
+def _is_invalid_index(name: str) -> bool:
+    """Whether ``name`` is an index left INVALID by an interrupted concurrent build."""
+    # Offline (--sql) scripts cannot inspect the catalog
+    if op.get_context().as_sql or op.get_bind().dialect.name != "postgresql":
+        return False
+    valid = op.get_bind().execute(
+        sa.text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).scalar()
+    return valid is False
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for column in TASK_INDEXES:
+            name = op.f(f"ix_tasks_{column}")
+            if _is_invalid_index(name):
+                op.drop_index(
+                    name,
+                    table_name="tasks",
+                    if_exists=True,
+                    postgresql_concurrently=True,
+                )
+            op.create_index(
+                name,
+                "tasks",
+                [column],
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in reversed(TASK_INDEXES):
+            op.drop_index(
+                op.f(f"ix_tasks_{column}"),
+                table_name="tasks",
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
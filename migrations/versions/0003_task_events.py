@@ -0,0 +1,96 @@
+"""task events: append-only task history, partitioned by month
+
+On PostgreSQL task_events is range-partitioned on occurred_at with a
+DEFAULT partition and monthly partitions for the current month and the
+next two; the application keeps creating them ahead of time
+(history.ensure_task_event_partitions). Other databases get a plain table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+task_event_type = sa.Enum("created", "updated", "deleted", name="taskeventtype")
+
+PARTITION_MONTHS_AHEAD = 2
+
+
+def _month_start(year: int, month: int) -> date:
+    return date(year + (month - 1) // 12, (month - 1) % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        task_event_type.create(bind, checkfirst=True)
+        # The partition key has to be part of the primary key
+        op.execute(
+            """
+            CREATE TABLE task_events (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+                task_id INTEGER NOT NULL,
+                occurred_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                event_type taskeventtype NOT NULL,
+                status taskstatus,
+                actor_id INTEGER,
+                changes JSONB,
+                PRIMARY KEY (id, occurred_at)
+            ) PARTITION BY RANGE (occurred_at)
+            """
+        )
+        op.execute("CREATE TABLE task_events_default PARTITION OF task_events DEFAULT")
+        today = date.today()
+        for offset in range(PARTITION_MONTHS_AHEAD + 1):
+            start = _month_start(today.year, today.month + offset)
+            end = _month_start(start.year, start.month + 1)
+            op.execute(
+                f"CREATE TABLE task_events_y{start.year}m{start.month:02d} "
+                f"PARTITION OF task_events FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+    else:
+        op.create_table(
+            "task_events",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("task_id", sa.Integer(), nullable=False),
+            sa.Column("occurred_at", sa.DateTime(), nullable=False),
+            sa.Column("event_type", task_event_type, nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("pending", "ongoing", "completed", name="taskstatus"),
+                nullable=True,
+            ),
+            sa.Column("actor_id", sa.Integer(), nullable=True),
+            sa.Column("changes", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    # Created on the (empty) parent table, so no need for CONCURRENTLY
+    op.create_index(
+        "ix_task_events_task_id_occurred_at", "task_events", ["task_id", "occurred_at"], unique=False
+    )
+    op.create_index(
+        "ix_task_events_status_occurred_at", "task_events", ["status", "occurred_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_task_events_status_occurred_at", table_name="task_events")
+    op.drop_index("ix_task_events_task_id_occurred_at", table_name="task_events")
+    # Dropping the parent drops every partition with it
+    op.drop_table("task_events")
+    task_event_type.drop(op.get_bind(), checkfirst=True)
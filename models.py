@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum, Text, JSON, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -9,6 +10,11 @@ class TaskStatus(enum.Enum):
     ongoing = "ongoing"
     completed = "completed"
 
+class TaskEventType(enum.Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+
 class User(Base):
     __tablename__ = "users"
     
@@ -36,11 +42,34 @@ class Task(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text)
-    status = Column(Enum(TaskStatus), default=TaskStatus.pending)
-    due_date = Column(DateTime)
-    employee_id = Column(Integer, ForeignKey("employees.id"))
+    status = Column(Enum(TaskStatus), default=TaskStatus.pending, index=True)
+    due_date = Column(DateTime, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Relationship with employee
-    employee = relationship("Employee", back_populates="tasks")
\ No newline at end of file
+    employee = relationship("Employee", back_populates="tasks")
+
+class TaskEvent(Base):
+    """Append-only history of task changes; rows are never updated or deleted.
+
+    Only the fields that changed are stored in ``changes``; a status change
+    goes in ``status`` instead so cycle-time queries can use an index. On
+    PostgreSQL the table is range-partitioned by month on ``occurred_at``
+    (see migrations/versions/0003_task_events.py).
+    """
+    __tablename__ = "task_events"
+    __table_args__ = (
+        Index("ix_task_events_task_id_occurred_at", "task_id", "occurred_at"),
+        Index("ix_task_events_status_occurred_at", "status", "occurred_at"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    # No foreign key: the history of a task outlives the task itself
+    task_id = Column(Integer, nullable=False)
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    event_type = Column(Enum(TaskEventType), nullable=False)
+    status = Column(Enum(TaskStatus))
+    actor_id = Column(Integer)
+    changes = Column(JSON().with_variant(JSONB, "postgresql"))
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from datetime import datetime
-from typing import Optional, List
-from models import TaskStatus
+from typing import Optional, List, Any, Dict, Literal
+from models import TaskStatus, TaskEventType
 
 # User Schemas
 class UserBase(BaseModel):
@@ -68,6 +68,49 @@ class Task(TaskBase):
     class Config:
         from_attributes = True
 
+# Task History Schemas
+class TaskEvent(BaseModel):
+    id: int
+    task_id: int
+    occurred_at: datetime
+    event_type: TaskEventType
+    status: Optional[TaskStatus] = None
+    actor_id: Optional[int] = None
+    changes: Optional[Dict[str, Any]] = None
+
+    class Config:
+        from_attributes = True
+
+class CycleTimeStats(BaseModel):
+    status: TaskStatus
+    since: datetime
+    until: Optional[datetime] = None
+    completed: int
+    in_status: int
+    average_seconds: Optional[float] = None
+    min_seconds: Optional[float] = None
+    max_seconds: Optional[float] = None
+
+# Batch Schemas
+MAX_BATCH_OPERATIONS = 50
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "DELETE"] = "GET"
+    path: str
+    body: Optional[Dict[str, Any]] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+    transactional: bool = False
+
+class BatchResult(BaseModel):
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchResult]
+    committed: Optional[bool] = None
+
 # Authentication Schemas
 class Token(BaseModel):
     access_token: str
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Production runner for Employee Task Manager API
+
+Starts uvicorn with one worker process per CPU core, as many as the
+connection budget allows (override with WEB_CONCURRENCY or --workers), and splits the database connection budget
+between them, so adding workers never exceeds what PostgreSQL allows.
+
+Usage:
+    python serve.py [--workers N] [--host HOST] [--port PORT]
+"""
+
+import argparse
+import logging
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Fewest connections a worker should get when the worker count is not
+# given explicitly: room for requests, health checks and maintenance
+MIN_WORKER_CONNECTIONS = 3
+
+def default_workers():
+    """One worker per available CPU core"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def split_pool_budget(budget, workers, uses_listener):
+    """Return (pool_size, max_overflow) per worker for a total connection budget.
+
+    Each worker gets an equal share; two thirds of it is kept open in the
+    pool and the rest is allowed as overflow. A worker using the PostgreSQL
+    invalidation channel holds one extra connection for LISTEN.
+    """
+    share = budget // workers - (1 if uses_listener else 0)
+    if share < 1:
+        raise SystemExit(
+            f"DB_POOL_BUDGET={budget} is too small for {workers} workers; "
+            "lower --workers or raise the budget"
+        )
+    pool_size = max(1, share * 2 // 3)
+    return pool_size, share - pool_size
+
+def cache_channel(workers):
+    """CACHE_CHANNEL the workers will use; None leaves caching off"""
+    if "CACHE_CHANNEL" in os.environ:
+        return os.environ["CACHE_CHANNEL"]
+    if workers == 1:
+        return "local"
+    if os.getenv("DATABASE_URL", "").startswith("postgresql"):
+        return "postgres"
+    # Otherwise there is no shared channel and caching stays off
+    return None
+
+def workers_for_budget(budget, uses_listener):
+    """Most workers that each get at least MIN_WORKER_CONNECTIONS from the budget"""
+    return max(1, budget // (MIN_WORKER_CONNECTIONS + (1 if uses_listener else 0)))
+
+def configure_workers(workers=None):
+    """Set the environment inherited by worker processes.
+
+    Without an explicit worker count, one worker per core is started, capped
+    at what DB_POOL_BUDGET can serve. An explicit count the budget cannot
+    serve is an error. Returns (workers, pool_size, max_overflow).
+    """
+    budget = int(os.getenv("DB_POOL_BUDGET", "20"))
+    if workers is None:
+        workers = default_workers()
+        limit = workers_for_budget(budget, cache_channel(workers) == "postgres")
+        if workers > limit:
+            logger.warning(
+                "DB_POOL_BUDGET=%d only allows %d of %d workers; starting %d "
+                "(raise the budget or set --workers to change this)",
+                budget, limit, workers, limit,
+            )
+            workers = limit
+
+    channel = cache_channel(workers)
+    if channel is not None:
+        os.environ["CACHE_CHANNEL"] = channel
+    pool_size, max_overflow = split_pool_budget(budget, workers, channel == "postgres")
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(max_overflow)
+    return workers, pool_size, max_overflow
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Employee Task Manager API")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "0")) or None)
+    parser.add_argument(
+        "--graceful-timeout",
+        type=int,
+        default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+        help="Seconds to let in-flight requests finish on shutdown",
+    )
+    args = parser.parse_args()
+
+    workers, pool_size, max_overflow = configure_workers(args.workers)
+    print(
+        f"Starting {workers} worker(s) on {args.host}:{args.port} "
+        f"(pool_size={pool_size}, max_overflow={max_overflow} per worker)"
+    )
+
+    # On SIGINT/SIGTERM uvicorn stops accepting connections, lets in-flight
+    # requests finish (up to the graceful timeout), then runs the lifespan
+    # shutdown which stops the invalidation listener and closes the pool.
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+    )
+
+if __name__ == "__main__":
+    main()
@@ -103,16 +103,20 @@ def test_api():
             }
             response = requests.put(f"{API_BASE_URL}/tasks/{new_task_id}", json=update_task, headers=headers)
             print_response(response, f"10. Update Task {new_task_id} Status")
+            
+            # Test 11: Get task history
+            response = requests.get(f"{API_BASE_URL}/tasks/{new_task_id}/history", headers=headers)
+            print_response(response, f"11. Get Task {new_task_id} History")
         
-        # Test 11: Register a new user
+        # Test 12: Register a new user
         new_user = {
             "username": "testuser",
             "password": "testpass123"
         }
         response = requests.post(f"{API_BASE_URL}/register", json=new_user)
-        print_response(response, "11. Register New User")
+        print_response(response, "12. Register New User")
         
-        # Test 12: Try to create employee with duplicate email (should fail)
+        # Test 13: Try to create employee with duplicate email (should fail)
         duplicate_employee = {
             "name": "Duplicate User",
             "email": "john.doe@company.com",  # This email already exists
@@ -120,7 +124,18 @@ def test_api():
             "position": "Test Position"
         }
         response = requests.post(f"{API_BASE_URL}/employees", json=duplicate_employee, headers=headers)
-        print_response(response, "12. Try to Create Employee with Duplicate Email")
+        print_response(response, "13. Try to Create Employee with Duplicate Email")
+        
+        # Test 14: Batch several reads into one request
+        batch = {
+            "operations": [
+                {"method": "GET", "path": "/employees"},
+                {"method": "GET", "path": "/tasks"},
+                {"method": "GET", "path": "/tasks/1"}
+            ]
+        }
+        response = requests.post(f"{API_BASE_URL}/batch", json=batch, headers=headers)
+        print_response(response, "14. Batch Request")
         
         print(f"\n{'='*50}")
         print("✅ API Testing Complete!")
@@ -129,6 +144,8 @@ def test_api():
         print("- ✅ Authentication system working")
         print("- ✅ Employee CRUD operations working")
         print("- ✅ Task CRUD operations working")
+        print("- ✅ Task history working")
+        print("- ✅ Batch requests working")
         print("- ✅ Error handling working")
         print("- ✅ Data validation working")
         